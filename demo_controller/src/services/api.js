@@ -139,6 +139,79 @@ export const sendControllerInput = (action, payload = {}) => {
     });
 };
 
+/**
+ * Send several controller actions to the server as one atomic batch.
+ *
+ * The server validates the whole batch, applies every action in order, and
+ * broadcasts a single state_update, so the demo-site never shows the
+ * intermediate states. If any action fails, none of them are applied.
+ *
+ * @param {Array<{action: string, payload?: object}>} actions - Ordered actions to apply
+ * @param {function} [onResult] - Optional callback receiving the server's
+ *     acknowledgement: { success, error?, results: [{ index, action, ok, error }] }.
+ *     Rate-limited or unanswered batches are reported with success: false.
+ *
+ * @example
+ * sendControllerBatch([
+ *     { action: 'set_demo', payload: { demo: 'searching-sorting' } },
+ *     { action: 'navigate', payload: { direction: 'next' } },
+ * ]);
+ */
+export const sendControllerBatch = (actions, onResult) => {
+    if (!socket || !socket.connected) {
+        console.error(`Cannot send batch of ${actions.length} actions: Socket not connected.`);
+        return;
+    }
+
+    const timestamp = Date.now();
+
+    // Emit a single controller_input_batch event in place of one event per action
+    socket.emit('controller_input_batch', {
+        actions: actions.map(({ action, payload = {} }) => ({ action, payload, timestamp })),
+        timestamp,
+    }, (response) => {
+        // A missing acknowledgement means the server dropped the batch unprocessed
+        const result = response || { success: false, error: 'No response from server', results: [] };
+        if (!result.success) {
+            console.error('Controller batch rejected:', result);
+        }
+        if (onResult) onResult(result);
+    });
+};
+
+/**
+ * Collect controller actions and send them together as one batch.
+ *
+ * Useful for composite gestures built up across several calls. Actions are
+ * queued until flush() is called.
+ *
+ * @returns {{add: function(string, object=): object, flush: function(function=): void}}
+ *
+ * @example
+ * const batch = createControllerBatch();
+ * batch.add('logic_gates_input', { inputA: true, inputB: false });
+ * batch.add('navigate', { direction: 'next' });
+ * batch.flush();
+ */
+export const createControllerBatch = () => {
+    let actions = [];
+
+    const batch = {
+        add(action, payload = {}) {
+            actions.push({ action, payload });
+            return batch;
+        },
+        flush(onResult) {
+            if (actions.length === 0) return;
+            const pending = actions;
+            actions = [];
+            sendControllerBatch(pending, onResult);
+        },
+    };
+
+    return batch;
+};
+
 // ----------------------------------------------------------------------
 // 3. Command Wrappers - High-level API for controller actions
 // ----------------------------------------------------------------------
@@ -8,9 +8,17 @@ disconnections, and other analytics data.
 Database Schema:
     Table: interaction_logs
         - id: BIGSERIAL PRIMARY KEY
-        - event_type: VARCHAR(50) - Type of event (e.g., 'connect', 'disconnect')
+        - event_type: VARCHAR(50) - Type of event (e.g., 'connect', 'disconnect', 'set_demo')
         - timestamp: TIMESTAMPTZ - When the event occurred
-        - details: TEXT - Additional event details (e.g., IP address, session ID)
+        - details: TEXT - Human-readable event description
+        - sid: VARCHAR(64) - Socket.IO session ID of the client
+        - client_ip: VARCHAR(45) - Remote address of the client
+        - role: VARCHAR(20) - Client role ('controller' or 'demo-site')
+        - demo: VARCHAR(50) - Active demo after the event
+        - slide: INTEGER - Active slide after the event
+        - metadata: JSONB - Event-specific data (e.g., controller action payload)
+
+    The structured columns are added by migrations/001_structured_interaction_logs.sql.
 
 Environment Variables Required:
     - DB_USER: PostgreSQL username
@@ -19,16 +27,28 @@ Environment Variables Required:
     - DB_PORT: Database port (default: 6543 for Supabase connection pooling)
     - DB_NAME: Database name (default: postgres)
 
+Optional Environment Variables:
+    - LOG_BATCH_SIZE: Maximum rows written per batched insert (default: 50)
+    - LOG_FLUSH_INTERVAL: Seconds to wait for more queued events before writing (default: 2)
+    - LOG_QUEUE_SIZE: Maximum queued events; further events are dropped (default: 1000)
+    - LOG_MAX_METADATA_BYTES: Largest JSON metadata stored per event (default: 2048)
+
 Note: If database credentials are not configured, logging will fail gracefully
       and the server will continue to operate without persistent logs.
 """
 
+import atexit
+import json
 import os
+import queue
+import threading
+import time
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 import logging
 import psycopg
 from psycopg.rows import dict_row
+from psycopg.types.json import Jsonb
 
 load_dotenv()
 
@@ -41,6 +61,19 @@ HOST = os.getenv("DB_HOST")
 PORT = os.getenv("DB_PORT", "6543")  # 6543 is Supabase's connection pooling port
 DBNAME = os.getenv("DB_NAME", "postgres")
 
+# Batched writer settings for queue_interaction()
+LOG_BATCH_SIZE = int(os.getenv("LOG_BATCH_SIZE", "50"))
+LOG_FLUSH_INTERVAL = float(os.getenv("LOG_FLUSH_INTERVAL", "2"))
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "1000"))
+# Larger metadata (e.g., oversized client payloads) is replaced with a size marker
+LOG_MAX_METADATA_BYTES = int(os.getenv("LOG_MAX_METADATA_BYTES", "2048"))
+
+INSERT_INTERACTION_SQL = """
+    INSERT INTO interaction_logs
+        (event_type, timestamp, details, sid, client_ip, role, demo, slide, metadata)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+"""
+
 # Debug logging to help diagnose credential issues during server startup
 logger.info("Database configuration check:")
 logger.info(f"  DB_USER: {'SET' if USER else 'MISSING'}")
@@ -50,13 +83,43 @@ logger.info(f"  DB_PORT: {PORT}")
 logger.info(f"  DB_NAME: {DBNAME}")
 
 
-def log_interaction(event_type: str, details: str = None):
+def _cap_metadata(metadata):
+    """Replace metadata that is not JSON-serializable or exceeds LOG_MAX_METADATA_BYTES."""
+    try:
+        size = len(json.dumps(metadata))
+    except (TypeError, ValueError):
+        return {'unserializable': True}
+    if size > LOG_MAX_METADATA_BYTES:
+        return {'truncated': True, 'size': size}
+    return metadata
+
+
+def _build_row(event_type, details, sid, client_ip, role, demo, slide, metadata):
+    """Build an INSERT_INTERACTION_SQL parameter tuple timestamped now."""
+    if metadata is not None:
+        metadata = _cap_metadata(metadata)
+    return (
+        event_type,
+        datetime.now(),
+        details,
+        sid,
+        client_ip,
+        role,
+        demo,
+        slide,
+        Jsonb(metadata) if metadata is not None else None
+    )
+
+
+def log_interaction(event_type: str, details: str = None, sid: str = None, client_ip: str = None,
+                    role: str = None, demo: str = None, slide: int = None, metadata: dict = None):
     """
     Log an interaction event to the Supabase PostgreSQL database.
 
-    This function is called by the server when significant events occur, such as
-    controller connections and disconnections. It provides analytics data for
-    understanding demo usage patterns.
+    This function writes one event synchronously, opening its own database
+    connection. It provides analytics data for understanding demo usage
+    patterns. The server's Socket.IO handlers use queue_interaction() instead
+    so they never wait on the database.
 
     Args:
         event_type (str): Type of event (e.g., 'connect', 'disconnect', 'navigate')
@@ -64,6 +127,12 @@ def log_interaction(event_type: str, details: str = None):
             Examples:
                 - 'Controller connected from 192.168.1.1 (SID: abc123)'
                 - 'Demo switched to logic-gates'
+        sid (str, optional): Socket.IO session ID of the client
+        client_ip (str, optional): Remote address of the client
+        role (str, optional): Client role ('controller' or 'demo-site')
+        demo (str, optional): Active demo after the event
+        slide (int, optional): Active slide after the event
+        metadata (dict, optional): Event-specific data stored as JSONB
 
     Returns:
         bool: True if logging succeeded, False if it failed or credentials missing
@@ -95,11 +164,8 @@ def log_interaction(event_type: str, details: str = None):
             with conn.cursor() as cursor:
                 # Insert interaction log with current timestamp
                 cursor.execute(
-                    """
-                    INSERT INTO interaction_logs (event_type, timestamp, details)
-                    VALUES (%s, %s, %s)
-                    """,
-                    (event_type, datetime.now(), details)
+                    INSERT_INTERACTION_SQL,
+                    _build_row(event_type, details, sid, client_ip, role, demo, slide, metadata)
                 )
                 conn.commit()
 
@@ -111,15 +177,181 @@ def log_interaction(event_type: str, details: str = None):
         return False
 
 
-def get_interaction_logs(limit: int = 100):
+# --- Batched Background Writer ---
+# Events recorded from Socket.IO handlers (connections, slide navigation, demo
+# switches) are queued in memory and written in batches by a single background
+# thread instead of opening a database connection inside the handler.
+
+_pending_rows = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+_writer_thread = None
+_writer_lock = threading.Lock()
+_dropped_rows = 0
+_dropped_lock = threading.Lock()
+_warned_unconfigured = False
+
+
+def queue_interaction(event_type: str, details: str = None, sid: str = None, client_ip: str = None,
+                      role: str = None, demo: str = None, slide: int = None, metadata: dict = None):
+    """
+    Queue an interaction event for a batched, asynchronous database write.
+
+    Takes the same arguments as log_interaction() but returns immediately; a
+    background thread writes queued events with one INSERT per batch of up to
+    LOG_BATCH_SIZE rows, waiting at most LOG_FLUSH_INTERVAL seconds for a
+    batch to fill.
+
+    Returns:
+        bool: True if the event was queued, False if credentials are missing
+            or the queue is full (the event is dropped)
+
+    Example:
+        queue_interaction('set_demo', 'Demo switched to logic-gates',
+                          sid=request.sid, role='controller', demo='logic-gates', slide=0)
+    """
+    global _writer_thread, _dropped_rows, _warned_unconfigured
+
+    # Skip when logging is not configured, warning only once since this is
+    # called from every Socket.IO handler that records events
+    if not all([USER, PASSWORD, HOST, PORT, DBNAME]):
+        if not _warned_unconfigured:
+            _warned_unconfigured = True
+            logger.warning("Database credentials not configured. Skipping queued interaction logs.")
+        return False
+
+    if _writer_thread is None:
+        with _writer_lock:
+            if _writer_thread is None:
+                _writer_thread = threading.Thread(
+                    target=_write_queued_interactions, name='interaction-log-writer', daemon=True
+                )
+                _writer_thread.start()
+
+    try:
+        _pending_rows.put_nowait(
+            _build_row(event_type, details, sid, client_ip, role, demo, slide, metadata)
+        )
+        return True
+    except queue.Full:
+        with _dropped_lock:
+            _dropped_rows += 1
+        return False
+
+
+def _write_queued_interactions():
+    """Background writer loop: collect queued rows into batches and insert them."""
+    while True:
+        rows = [_pending_rows.get()]
+        deadline = time.monotonic() + LOG_FLUSH_INTERVAL
+        while len(rows) < LOG_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                rows.append(_pending_rows.get(timeout=remaining))
+            except queue.Empty:
+                break
+        _insert_rows(rows)
+
+
+def _report_dropped_rows():
+    """Log and reset the count of events dropped because the queue was full."""
+    global _dropped_rows
+
+    with _dropped_lock:
+        dropped, _dropped_rows = _dropped_rows, 0
+    if dropped:
+        logger.warning(f"Interaction log queue was full; dropped {dropped} events")
+
+
+def _insert_rows(rows):
+    """
+    Insert a batch of prepared rows in a single transaction.
+
+    If the batch insert fails, each row is retried in its own transaction so
+    that one bad row does not lose the rest of the batch.
+    """
+    # Report drops before writing so they are logged even while the database is down
+    _report_dropped_rows()
+
+    try:
+        with psycopg.connect(
+            user=USER,
+            password=PASSWORD,
+            host=HOST,
+            port=PORT,
+            dbname=DBNAME
+        ) as conn:
+            with conn.cursor() as cursor:
+                cursor.executemany(INSERT_INTERACTION_SQL, rows)
+                conn.commit()
+
+        logger.info(f"Logged {len(rows)} queued interactions")
+
+    except Exception as e:
+        logger.error(f"Failed to log {len(rows)} queued interactions: {e}")
+        if len(rows) > 1:
+            _insert_rows_individually(rows)
+
+
+def _insert_rows_individually(rows):
+    """Fallback for a failed batch: insert each row separately, skipping bad ones."""
+    failed = 0
+    try:
+        with psycopg.connect(
+            user=USER,
+            password=PASSWORD,
+            host=HOST,
+            port=PORT,
+            dbname=DBNAME,
+            autocommit=True
+        ) as conn:
+            with conn.cursor() as cursor:
+                for row in rows:
+                    try:
+                        cursor.execute(INSERT_INTERACTION_SQL, row)
+                    except Exception as e:
+                        failed += 1
+                        logger.error(f"Failed to log queued {row[0]} interaction: {e}")
+
+        logger.info(f"Logged {len(rows) - failed} of {len(rows)} queued interactions individually")
+
+    except Exception as e:
+        logger.error(f"Failed to retry {len(rows)} queued interactions: {e}")
+
+
+@atexit.register
+def flush_queued_interactions():
+    """
+    Write any events still waiting in the queue.
+
+    Registered with atexit so queued demo events are not lost when the server
+    shuts down cleanly.
+    """
+    rows = []
+    while True:
+        try:
+            rows.append(_pending_rows.get_nowait())
+        except queue.Empty:
+            break
+    if rows:
+        _insert_rows(rows)
+
+
+def get_interaction_logs(limit: int = 100, event_type: str = None, sid: str = None,
+                         client_ip: str = None, demo: str = None):
     """
     Retrieve interaction logs from the Supabase PostgreSQL database.
 
     This function is called by the /api/interaction-log endpoint to fetch
-    recent user interaction data for analytics and debugging purposes.
+    recent user interaction data for analytics and debugging purposes. The
+    optional filters use the indexed structured columns.
 
     Args:
         limit (int): Maximum number of logs to retrieve (default: 100)
+        event_type (str, optional): Only return events of this type
+        sid (str, optional): Only return events from this Socket.IO session
+        client_ip (str, optional): Only return events from this address
+        demo (str, optional): Only return events recorded in this demo
 
     Returns:
         list: List of dictionaries, each containing:
@@ -127,6 +359,8 @@ def get_interaction_logs(limit: int = 100):
             - event_type (str): Type of event
             - timestamp (str): ISO format timestamp
             - details (str): Additional event details
+            - sid, client_ip, role, demo, slide, metadata: Structured fields
+              (None when not recorded)
 
         Returns empty list if database is not configured or query fails.
 
@@ -136,7 +370,13 @@ def get_interaction_logs(limit: int = 100):
                 "id": 123,
                 "event_type": "connect",
                 "timestamp": "2025-12-06T10:30:00",
-                "details": "Controller connected from 192.168.1.1"
+                "details": "Controller connected from 192.168.1.1",
+                "sid": "abc123",
+                "client_ip": "192.168.1.1",
+                "role": "controller",
+                "demo": null,
+                "slide": null,
+                "metadata": null
             }
         ]
     """
@@ -154,15 +394,23 @@ def get_interaction_logs(limit: int = 100):
         ) as conn:
             # Use dict_row factory to get results as dictionaries instead of tuples
             with conn.cursor(row_factory=dict_row) as cursor:
+                # Build WHERE clause from fixed column names only; values are parameterized
+                filters = {'event_type': event_type, 'sid': sid, 'client_ip': client_ip, 'demo': demo}
+                conditions = [f"{column} = %s" for column, value in filters.items() if value is not None]
+                params = [value for value in filters.values() if value is not None]
+                where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
                 # Retrieve logs ordered by timestamp (most recent first)
                 cursor.execute(
-                    """
-                    SELECT id, event_type, timestamp, details
+                    f"""
+                    SELECT id, event_type, timestamp, details,
+                           sid, client_ip, role, demo, slide, metadata
                     FROM interaction_logs
+                    {where}
                     ORDER BY timestamp DESC
                     LIMIT %s
                     """,
-                    (limit,)
+                    (*params, limit)
                 )
 
                 results = cursor.fetchall()
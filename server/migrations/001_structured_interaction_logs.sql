@@ -0,0 +1,43 @@
+-- Migration 001: Structured, indexed event schema for interaction_logs
+--
+-- Adds typed columns for the session ID, client IP, client role, demo, and
+-- slide so analytics queries no longer need to scan and parse the free-text
+-- `details` column. Existing rows are backfilled by parsing `details`, which
+-- was written in one of these formats:
+--     'Controller connected from {ip} (SID: {sid})'
+--     'Controller disconnected (SID: {sid})'
+--
+-- Safe to run more than once. Run it in the Supabase SQL Editor.
+
+BEGIN;
+
+ALTER TABLE interaction_logs
+  ADD COLUMN IF NOT EXISTS sid VARCHAR(64),
+  ADD COLUMN IF NOT EXISTS client_ip VARCHAR(45),
+  ADD COLUMN IF NOT EXISTS role VARCHAR(20),
+  ADD COLUMN IF NOT EXISTS demo VARCHAR(50),
+  ADD COLUMN IF NOT EXISTS slide INTEGER,
+  ADD COLUMN IF NOT EXISTS metadata JSONB;
+
+-- Backfill structured columns from legacy details strings. Only rows without
+-- a sid are touched, so re-running does not rewrite already backfilled rows
+-- (legacy disconnect rows never contain an IP).
+UPDATE interaction_logs
+SET
+  sid = COALESCE(sid, substring(details FROM '\(SID: ([^)]+)\)')),
+  client_ip = COALESCE(client_ip, substring(details FROM ' from (\S+) \(SID:')),
+  role = COALESCE(role, CASE WHEN details LIKE 'Controller %' THEN 'controller' END)
+WHERE details IS NOT NULL
+  AND sid IS NULL;
+
+-- Indexes for the common per-session, per-IP, per-demo, and per-event lookups
+CREATE INDEX IF NOT EXISTS idx_interaction_logs_sid
+  ON interaction_logs(sid);
+CREATE INDEX IF NOT EXISTS idx_interaction_logs_client_ip_timestamp
+  ON interaction_logs(client_ip, timestamp DESC);
+CREATE INDEX IF NOT EXISTS idx_interaction_logs_demo_timestamp
+  ON interaction_logs(demo, timestamp DESC) WHERE demo IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_interaction_logs_event_type_timestamp
+  ON interaction_logs(event_type, timestamp DESC);
+
+COMMIT;
@@ -0,0 +1,372 @@
+"""
+On-Demand Profiling Module for Live Handler Hot Spots
+
+This module lets an administrator profile the running server for a bounded
+window without restarting it under an external profiler. Functions decorated
+with HandlerProfiler.profiled (the Socket.IO handlers in server.py and the
+database.py calls) are measured only while a profiling session is active.
+
+Profiling Modes:
+    - deterministic: Each decorated call runs under cProfile. Results contain
+      exact call counts and cumulative/total time for every function reached
+      from a handler.
+    - sampling: A background thread periodically captures the stacks of
+      threads currently inside a decorated call. Results contain sample
+      counts per function and a collapsed-stack export compatible with
+      flamegraph.pl and speedscope.
+
+Cost When Disabled:
+    When no session is active, a decorated call performs a single attribute
+    check before calling the wrapped function. No profiler is installed and
+    no sampler thread runs.
+
+Sessions end automatically when their duration elapses; the results of the
+most recent session remain available until the next one is started.
+"""
+
+import cProfile
+import math
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from functools import wraps
+
+PROFILE_MODES = ('deterministic', 'sampling')
+
+# Shortest allowed sampling interval, so the sampler thread cannot starve handlers
+MIN_SAMPLE_INTERVAL = 0.001
+
+
+class ProfileSession:
+    """
+    State and aggregated results of one profiling window.
+
+    Not used directly; created by HandlerProfiler.start().
+    """
+
+    def __init__(self, mode: str, duration: float, interval: float):
+        self.mode = mode
+        self.interval = interval
+        self.started_at = time.time()
+        self.deadline = time.monotonic() + duration
+        self.ended_at = None
+        self.lock = threading.Lock()
+        # Per-handler call counts and wall-clock time (both modes)
+        self.handler_calls = Counter()
+        self.handler_time = Counter()
+        # Deterministic mode: merged cProfile statistics
+        self.stats = None
+        # Calls that could not be profiled because another profiler was active
+        self.skipped_calls = 0
+        # Sampling mode: thread ident -> handler label, and collapsed stack counts
+        self.active_threads = {}
+        self.samples = Counter()
+        self.stop_event = threading.Event()
+
+    @property
+    def expired(self):
+        return time.monotonic() >= self.deadline
+
+    def record_call(self, label, elapsed, profile=None):
+        """Merge the results of one decorated call into the session."""
+        with self.lock:
+            self.handler_calls[label] += 1
+            self.handler_time[label] += elapsed
+            if profile is not None:
+                if self.stats is None:
+                    self.stats = pstats.Stats(profile)
+                else:
+                    self.stats.add(profile)
+
+
+class HandlerProfiler:
+    """
+    Bounded-window profiler for decorated server functions.
+
+    Only one session can be active at a time. Nested decorated calls (for
+    example a handler calling log_interaction) are attributed to the
+    outermost call, which already profiles everything beneath it.
+    """
+
+    def __init__(self):
+        self._session = None
+        self._last_session = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    # ------------------------------------------------------------------
+    # Session control
+    # ------------------------------------------------------------------
+
+    def start(self, mode: str = 'deterministic', duration: float = 30, interval: float = 0.005):
+        """
+        Start a profiling session, replacing any session currently running.
+
+        Args:
+            mode (str): 'deterministic' or 'sampling'
+            duration (float): Length of the profiling window in seconds
+            interval (float): Seconds between stack samples (sampling mode only),
+                raised to MIN_SAMPLE_INTERVAL if smaller
+
+        Returns:
+            dict: Status of the new session (see status())
+
+        Raises:
+            ValueError: If mode is unknown or duration/interval are not
+                positive finite numbers
+        """
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profiling mode '{mode}'. Use one of: {', '.join(PROFILE_MODES)}")
+        # NaN compares False against everything, so check finiteness explicitly;
+        # a NaN deadline would keep the session active forever
+        if not math.isfinite(duration) or not math.isfinite(interval):
+            raise ValueError('duration and interval must be finite numbers')
+        if duration <= 0 or interval <= 0:
+            raise ValueError('duration and interval must be positive')
+        interval = max(interval, MIN_SAMPLE_INTERVAL)
+
+        with self._lock:
+            if self._session is not None:
+                self._finish(self._session)
+            session = ProfileSession(mode, duration, interval)
+            if mode == 'sampling':
+                threading.Thread(
+                    target=self._sample, args=(session,), name='profiler-sampler', daemon=True
+                ).start()
+            self._session = session
+
+        return self.status()
+
+    def stop(self):
+        """
+        Stop the active profiling session, if any.
+
+        Returns:
+            dict: Status of the stopped session (see status())
+        """
+        with self._lock:
+            if self._session is not None:
+                self._finish(self._session)
+        return self.status()
+
+    def _finish(self, session):
+        """Mark a session as ended. Caller must hold self._lock."""
+        session.stop_event.set()
+        session.ended_at = time.time()
+        if self._session is session:
+            self._session = None
+        self._last_session = session
+
+    def _current(self):
+        """Return the active or most recent session, ending it if it has expired."""
+        with self._lock:
+            if self._session is not None and self._session.expired:
+                self._finish(self._session)
+            return self._session or self._last_session
+
+    def status(self):
+        """
+        Describe the active or most recent profiling session.
+
+        Returns:
+            dict: Containing active (bool) and, if a session exists, mode,
+                started_at and ended_at (epoch seconds), and total handler
+                calls so far
+        """
+        session = self._current()
+        if session is None:
+            return {'active': False}
+        return {
+            'active': session is self._session,
+            'mode': session.mode,
+            'started_at': session.started_at,
+            'ended_at': session.ended_at,
+            'calls': sum(session.handler_calls.values()),
+        }
+
+    # ------------------------------------------------------------------
+    # Instrumentation
+    # ------------------------------------------------------------------
+
+    def profiled(self, func):
+        """
+        Decorator that measures a function while a profiling session is active.
+
+        Example:
+            @socketio.on('identify')
+            @profiler.profiled
+            def handle_identify(data):
+                ...
+        """
+        label = f"{func.__module__}.{func.__qualname__}"
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            session = self._session
+            if session is None or getattr(self._local, 'active', False):
+                return func(*args, **kwargs)
+            if session.expired:
+                with self._lock:
+                    if self._session is session:
+                        self._finish(session)
+                return func(*args, **kwargs)
+
+            self._local.active = True
+            try:
+                if session.mode == 'deterministic':
+                    return self._run_deterministic(session, label, func, args, kwargs)
+                return self._run_sampled(session, label, func, args, kwargs)
+            finally:
+                self._local.active = False
+
+        return wrapper
+
+    def _run_deterministic(self, session, label, func, args, kwargs):
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler is already active (e.g. concurrent handler on
+            # Python 3.12+, where cProfile is process-wide); run unprofiled
+            with session.lock:
+                session.skipped_calls += 1
+            return func(*args, **kwargs)
+
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profile.disable()
+            session.record_call(label, time.perf_counter() - start, profile)
+
+    def _run_sampled(self, session, label, func, args, kwargs):
+        ident = threading.get_ident()
+        session.active_threads[ident] = label
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            session.active_threads.pop(ident, None)
+            session.record_call(label, time.perf_counter() - start)
+
+    def _sample(self, session):
+        """Sampler thread body: collect stacks of threads inside decorated calls."""
+        wrapper_code = self.profiled(lambda: None).__code__
+        internal_code = (wrapper_code, self._run_sampled.__code__)
+        while not session.stop_event.wait(session.interval) and not session.expired:
+            frames = sys._current_frames()
+            for ident, label in list(session.active_threads.items()):
+                frame = frames.get(ident)
+                stack = []
+                depth = None
+                # Walk from the leaf to the root, remembering where the
+                # outermost profiled wrapper sits and skipping profiler frames
+                while frame is not None:
+                    code = frame.f_code
+                    if code is wrapper_code:
+                        depth = len(stack)
+                    elif code not in internal_code:
+                        stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                if depth is None:
+                    continue
+                stack = stack[:depth]
+                stack.append(label)
+                with session.lock:
+                    session.samples[';'.join(reversed(stack))] += 1
+
+    # ------------------------------------------------------------------
+    # Results
+    # ------------------------------------------------------------------
+
+    def results(self, limit: int = 30, sort: str = 'cumulative'):
+        """
+        Aggregate the active or most recent session into JSON-serializable results.
+
+        Args:
+            limit (int): Maximum number of functions to include
+            sort (str): 'cumulative' or 'tottime' (deterministic mode), or
+                'total' or 'self' sample counts (sampling mode)
+
+        Returns:
+            dict: Containing the session status, per-handler call counts and
+                time, and top_functions. Empty dict if no session has run.
+
+        Example return value (deterministic mode):
+            {
+                "active": false,
+                "mode": "deterministic",
+                "handlers": [{"name": "server.handle_identify", "calls": 12, "total_time": 0.84}],
+                "top_functions": [
+                    {"function": "database.py:54(log_interaction)", "calls": 12,
+                     "primitive_calls": 12, "total_time": 0.001, "cumulative_time": 0.83}
+                ]
+            }
+        """
+        session = self._current()
+        if session is None:
+            return {}
+
+        with session.lock:
+            result = self.status()
+            result['skipped_calls'] = session.skipped_calls
+            result['handlers'] = [
+                {'name': name, 'calls': calls, 'total_time': session.handler_time[name]}
+                for name, calls in session.handler_calls.most_common()
+            ]
+            if session.mode == 'deterministic':
+                result['top_functions'] = self._top_deterministic(session, limit, sort)
+            else:
+                result['sample_count'] = sum(session.samples.values())
+                result['top_functions'] = self._top_sampled(session, limit, sort)
+        return result
+
+    @staticmethod
+    def _top_deterministic(session, limit, sort):
+        if session.stats is None:
+            return []
+        sort_index = 2 if sort == 'tottime' else 3
+        rows = sorted(session.stats.stats.items(), key=lambda item: item[1][sort_index], reverse=True)
+        return [
+            {
+                'function': f"{os.path.basename(filename)}:{line}({name})",
+                'calls': ncalls,
+                'primitive_calls': primitive,
+                'total_time': tottime,
+                'cumulative_time': cumtime,
+            }
+            for (filename, line, name), (primitive, ncalls, tottime, cumtime, _) in rows[:limit]
+        ]
+
+    @staticmethod
+    def _top_sampled(session, limit, sort):
+        self_samples = Counter()
+        total_samples = Counter()
+        for stack, count in session.samples.items():
+            frames = stack.split(';')
+            self_samples[frames[-1]] += count
+            # Count recursive functions once per stack
+            for frame in set(frames):
+                total_samples[frame] += count
+        ranking = self_samples if sort == 'self' else total_samples
+        return [
+            {'function': frame, 'self_samples': self_samples[frame], 'total_samples': total_samples[frame]}
+            for frame, _ in ranking.most_common(limit)
+        ]
+
+    def collapsed(self):
+        """
+        Export sampled stacks in collapsed-stack format ('a;b;c count' per line).
+
+        Returns:
+            str | None: Collapsed stacks for flamegraph.pl or speedscope, or
+                None if the most recent session did not use sampling mode
+        """
+        session = self._current()
+        if session is None or session.mode != 'sampling':
+            return None
+        with session.lock:
+            return ''.join(f"{stack} {count}\n" for stack, count in session.samples.most_common())
@@ -0,0 +1,291 @@
+"""
+Rate Limiting Module for Socket.IO Events
+
+This module provides per-connection and per-address token-bucket rate limiting
+for the server's Socket.IO event handlers. Every limited event type has two
+independent buckets for each client: one keyed by Socket.IO session ID (SID)
+and one keyed by remote address, so opening many sockets from one machine
+does not bypass the limit.
+
+Token Bucket:
+    Each bucket holds up to `burst` tokens and refills at `rate` tokens per
+    second. An event consumes one token; if the bucket is empty the event is
+    rejected.
+
+Rejection Path:
+    Rejected events are dropped without any string formatting, logging, or
+    database work. Instead, a counter per (event, scope) is incremented and
+    exposed through RateLimiter.stats() for the /api/rate-limit/stats endpoint.
+    Handlers also use reject_unauthorized() to count controller input from
+    non-controller sockets the same way.
+
+Client Addresses:
+    Per-address limits key on request.remote_addr. Behind a reverse proxy this
+    is the proxy's address unless the server is configured to trust forwarded
+    headers (see TRUSTED_PROXY_HOPS in server.py's Config).
+
+First-Event Exemption:
+    Events registered with exempt_first=True (identify, request_state) skip
+    the per-address bucket the first time each SID sends them. Other sockets
+    sharing an address therefore cannot stop a new controller or demo-site
+    from identifying and receiving state.
+
+Configuration:
+    Limits are supplied by the server's Config class as dictionaries mapping
+    event names to (rate, burst) tuples. Events without an entry are not
+    limited.
+"""
+
+import threading
+import time
+from collections import Counter
+from functools import wraps
+
+from flask import request
+
+
+def parse_limit(value: str):
+    """
+    Parse a rate limit specification of the form 'rate/burst'.
+
+    Args:
+        value (str): Refill rate in events per second and bucket size,
+            e.g. '5/10' for 5 events per second with bursts of up to 10
+
+    Returns:
+        tuple: (rate, burst) as floats, or None if value is empty or '0'
+            (meaning the event is not limited)
+
+    Example:
+        parse_limit('5/10')  # -> (5.0, 10.0)
+    """
+    if not value or value.strip() == '0':
+        return None
+    rate, _, burst = value.partition('/')
+    rate = float(rate)
+    return (rate, float(burst) if burst else rate)
+
+
+class RateLimiter:
+    """
+    Token-bucket rate limiter keyed by event type, SID, and remote address.
+
+    Thread-safe: the server runs Socket.IO handlers on gthread worker threads,
+    so all bucket and counter updates happen under a single lock.
+    """
+
+    # Prune idle buckets once the table grows beyond this many entries
+    MAX_BUCKETS = 10000
+    # Minimum seconds between prunes, so a flood cannot force a scan per event
+    PRUNE_INTERVAL = 1.0
+
+    def __init__(self, sid_limits: dict, ip_limits: dict, enabled: bool = True):
+        """
+        Args:
+            sid_limits (dict): Event name -> (rate, burst) applied per SID
+            ip_limits (dict): Event name -> (rate, burst) applied per remote address
+            enabled (bool): If False, allow() always returns True
+        """
+        self.enabled = enabled
+        self._limits = {
+            'sid': {event: limit for event, limit in sid_limits.items() if limit},
+            'ip': {event: limit for event, limit in ip_limits.items() if limit},
+        }
+        # (scope, event, key) -> [tokens, last_refill_time]
+        self._buckets = {}
+        # (event, scope) -> number of rejected events; scope is 'sid', 'ip', or 'unauthorized'
+        self._rejected = Counter()
+        # SIDs already logged once for sending controller input without being the controller
+        self._unauthorized_sids = set()
+        # sid -> per-SID bucket keys, so disconnect cleanup does not scan every bucket
+        self._sid_keys = {}
+        # sid -> events that already used their first-event exemption
+        self._exempted = {}
+        self._last_prune = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, scope, event, key, now):
+        """Return the refilled bucket for a key, or None if unlimited. Caller must hold the lock."""
+        limit = self._limits[scope].get(event)
+        if limit is None:
+            return None
+
+        rate, burst = limit
+        bucket = self._buckets.get((scope, event, key))
+        if bucket is None:
+            bucket = self._buckets[(scope, event, key)] = [burst, now]
+            if scope == 'sid':
+                self._sid_keys.setdefault(key, set()).add((scope, event, key))
+        else:
+            bucket[0] = min(burst, bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+        return bucket
+
+    def allow(self, event: str, sid: str, address: str, exempt_first: bool = False):
+        """
+        Check whether an event from the given client is within its limits.
+
+        Args:
+            event (str): Socket.IO event name
+            sid (str): Socket.IO session ID of the sender
+            address (str): Remote address of the sender
+            exempt_first (bool): Skip the per-address bucket for the first
+                event of this type from this SID
+
+        Returns:
+            bool: True if the event should be handled, False if it should be dropped
+        """
+        if not self.enabled:
+            return True
+
+        now = time.monotonic()
+        with self._lock:
+            # Check both buckets before consuming from either, so an event
+            # dropped by the per-address limit does not cost a per-SID token
+            sid_bucket = self._refill('sid', event, sid, now)
+            if sid_bucket is not None and sid_bucket[0] < 1:
+                self._rejected[(event, 'sid')] += 1
+                return False
+            if exempt_first and event not in self._exempted.get(sid, ()):
+                self._exempted.setdefault(sid, set()).add(event)
+                ip_bucket = None
+            else:
+                ip_bucket = self._refill('ip', event, address, now)
+            if ip_bucket is not None and ip_bucket[0] < 1:
+                self._rejected[(event, 'ip')] += 1
+                return False
+
+            if sid_bucket is not None:
+                sid_bucket[0] -= 1
+            if ip_bucket is not None:
+                ip_bucket[0] -= 1
+
+            if len(self._buckets) > self.MAX_BUCKETS and now - self._last_prune >= self.PRUNE_INTERVAL:
+                self._prune(now)
+        return True
+
+    def _prune(self, now):
+        """
+        Drop buckets that have refilled completely, then evict the least
+        recently used buckets if the table is still too large. Caller must
+        hold the lock.
+        """
+        self._last_prune = now
+        for bucket_key, (tokens, last) in list(self._buckets.items()):
+            rate, burst = self._limits[bucket_key[0]][bucket_key[1]]
+            if tokens + (now - last) * rate >= burst:
+                self._delete_bucket(bucket_key)
+
+        excess = len(self._buckets) - self.MAX_BUCKETS
+        if excess > 0:
+            oldest = sorted(self._buckets, key=lambda bucket_key: self._buckets[bucket_key][1])
+            for bucket_key in oldest[:excess]:
+                self._delete_bucket(bucket_key)
+
+    def _delete_bucket(self, bucket_key):
+        """Remove a bucket and its SID index entry. Caller must hold the lock."""
+        del self._buckets[bucket_key]
+        scope, _, key = bucket_key
+        if scope == 'sid':
+            keys = self._sid_keys.get(key)
+            if keys is not None:
+                keys.discard(bucket_key)
+                if not keys:
+                    del self._sid_keys[key]
+
+    def reject_unauthorized(self, event: str, sid: str):
+        """
+        Count an event from a client that is not allowed to send it.
+
+        Used by handlers to drop input from non-controller sockets cheaply:
+        the rejection is only counted, and the caller should log at most once
+        per SID.
+
+        Args:
+            event (str): Socket.IO event name
+            sid (str): Socket.IO session ID of the sender
+
+        Returns:
+            bool: True the first time this SID is rejected (the caller may log
+                it), False for every later rejection
+        """
+        with self._lock:
+            self._rejected[(event, 'unauthorized')] += 1
+            if sid in self._unauthorized_sids:
+                return False
+            self._unauthorized_sids.add(sid)
+            return True
+
+    def forget_sid(self, sid: str):
+        """
+        Remove all per-SID state for a disconnected session.
+
+        Args:
+            sid (str): Socket.IO session ID that disconnected
+        """
+        with self._lock:
+            self._unauthorized_sids.discard(sid)
+            self._exempted.pop(sid, None)
+            for bucket_key in self._sid_keys.pop(sid, ()):
+                self._buckets.pop(bucket_key, None)
+
+    def stats(self):
+        """
+        Return aggregated rejection counters.
+
+        Returns:
+            dict: Containing:
+                - enabled (bool): Whether rate limiting is active
+                - rejected (dict): event -> {'sid': count, 'ip': count, 'unauthorized': count}
+                - total_rejected (int): Sum of all rejections
+                - active_buckets (int): Number of buckets currently tracked
+
+        Example return value:
+            {
+                "enabled": true,
+                "rejected": {"controller_input": {"sid": 42, "ip": 0, "unauthorized": 3}},
+                "total_rejected": 45,
+                "active_buckets": 7
+            }
+        """
+        with self._lock:
+            rejected = {}
+            for (event, scope), count in self._rejected.items():
+                rejected.setdefault(event, {'sid': 0, 'ip': 0, 'unauthorized': 0})[scope] = count
+            return {
+                'enabled': self.enabled,
+                'rejected': rejected,
+                'total_rejected': sum(self._rejected.values()),
+                'active_buckets': len(self._buckets),
+            }
+
+    def limit(self, event: str, rejected=None, exempt_first: bool = False):
+        """
+        Decorator that drops Socket.IO events exceeding this limiter's limits.
+
+        Over-limit events return `rejected` immediately without calling the
+        handler, so no logging, emitting, or database work is done for them.
+
+        Args:
+            event (str): Socket.IO event name used to look up the limits
+            rejected (optional): Constant returned for dropped events. For
+                events sent with an acknowledgement callback this is what the
+                client receives, so it should follow the handler's ack format.
+                Must not be mutated, since it is shared by every rejection.
+            exempt_first (bool): Skip the per-address bucket for the first
+                event of this type from each SID
+
+        Example:
+            @socketio.on('request_state')
+            @rate_limiter.limit('request_state', exempt_first=True)
+            def handle_state_request():
+                ...
+        """
+        def decorator(handler):
+            @wraps(handler)
+            def wrapper(*args, **kwargs):
+                if not self.allow(event, request.sid, request.remote_addr, exempt_first):
+                    return rejected
+                return handler(*args, **kwargs)
+            return wrapper
+        return decorator
@@ -20,10 +20,17 @@ user inputs like navigation and logic gate toggles.
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 from flask_socketio import SocketIO, emit, join_room, leave_room
+from werkzeug.middleware.proxy_fix import ProxyFix
+import copy
+import hmac
 import logging
 import os
+import threading
 from datetime import datetime
-from database import log_interaction, get_interaction_logs, clear_old_logs
+from database import queue_interaction, get_interaction_logs, clear_old_logs
+from rate_limit import RateLimiter, parse_limit
+from profiler import HandlerProfiler, PROFILE_MODES
+from functools import wraps
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -38,6 +45,32 @@ class Config:
     # Use a secure list of origins in production, '*' for development
     CORS_ORIGINS = os.environ.get('CORS_ORIGINS', '*').split(',')
     #CORS_ORIGINS = '*'
+    # Upper bound on actions accepted in a single controller_input_batch event
+    MAX_BATCH_ACTIONS = int(os.environ.get('MAX_BATCH_ACTIONS', '20'))
+    # Token-bucket limits for Socket.IO events as 'rate/burst' (events per second / bucket size).
+    # Per-SID limits apply to each socket; per-IP limits apply to all sockets from one address.
+    RATE_LIMIT_ENABLED = os.environ.get('RATE_LIMIT_ENABLED', 'True').lower() == 'true'
+    # Number of trusted reverse proxies in front of the server (e.g. 1 on Render).
+    # When set, client addresses are taken from X-Forwarded-For so per-IP limits
+    # apply per client instead of to the proxy. Leave at 0 when clients connect
+    # directly, otherwise the header could be spoofed to evade limits.
+    TRUSTED_PROXY_HOPS = int(os.environ.get('TRUSTED_PROXY_HOPS', '0'))
+    RATE_LIMITS_PER_SID = {
+        'controller_input': parse_limit(os.environ.get('RATE_LIMIT_CONTROLLER_INPUT_SID', '20/40')),
+        'controller_input_batch': parse_limit(os.environ.get('RATE_LIMIT_CONTROLLER_INPUT_BATCH_SID', '5/10')),
+        'identify': parse_limit(os.environ.get('RATE_LIMIT_IDENTIFY_SID', '0.2/3')),
+        'request_state': parse_limit(os.environ.get('RATE_LIMIT_REQUEST_STATE_SID', '2/5')),
+    }
+    RATE_LIMITS_PER_IP = {
+        'controller_input': parse_limit(os.environ.get('RATE_LIMIT_CONTROLLER_INPUT_IP', '50/100')),
+        'controller_input_batch': parse_limit(os.environ.get('RATE_LIMIT_CONTROLLER_INPUT_BATCH_IP', '10/20')),
+        'identify': parse_limit(os.environ.get('RATE_LIMIT_IDENTIFY_IP', '1/10')),
+        'request_state': parse_limit(os.environ.get('RATE_LIMIT_REQUEST_STATE_IP', '10/30')),
+    }
+    # Bearer token for /api/admin/* endpoints; admin endpoints are disabled when unset
+    ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')
+    # Upper bound on the length of an on-demand profiling window, in seconds
+    PROFILE_MAX_DURATION = float(os.environ.get('PROFILE_MAX_DURATION', '300'))
 
 
 # Initialize Flask app
@@ -65,6 +98,25 @@ socketio = SocketIO(
     # ping_interval=25
 )
 
+# Trust X-Forwarded-For/-Proto from the configured number of proxies. Wrapped
+# after SocketIO so the fixed REMOTE_ADDR is also seen by Socket.IO handlers.
+if Config.TRUSTED_PROXY_HOPS > 0:
+    app.wsgi_app = ProxyFix(
+        app.wsgi_app,
+        x_for=Config.TRUSTED_PROXY_HOPS,
+        x_proto=Config.TRUSTED_PROXY_HOPS
+    )
+
+# Per-SID and per-address token buckets for Socket.IO events
+rate_limiter = RateLimiter(
+    Config.RATE_LIMITS_PER_SID,
+    Config.RATE_LIMITS_PER_IP,
+    enabled=Config.RATE_LIMIT_ENABLED
+)
+
+# On-demand profiler for Socket.IO handlers and database calls (idle until started)
+profiler = HandlerProfiler()
+
 # Configure logging
 logging.basicConfig(
     level=getattr(logging, Config.LOG_LEVEL),
@@ -72,6 +124,11 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Profile database calls whether they come from Socket.IO handlers or REST routes
+queue_interaction = profiler.profiled(queue_interaction)
+get_interaction_logs = profiler.profiled(get_interaction_logs)
+clear_old_logs = profiler.profiled(clear_old_logs)
+
 # Security headers middleware
 @app.after_request
 def add_security_headers(response):
@@ -100,6 +157,21 @@ demo_state = {
 active_controller_sid = None
 CONTROLLER_ROOM_PREFIX = 'demo_controller_'
 
+# Serializes updates to demo_state so batched inputs are applied atomically
+# with respect to other handlers running on gthread worker threads
+state_lock = threading.Lock()
+
+
+def snapshot_state():
+    """
+    Return a consistent copy of demo_state for sending to clients.
+
+    Emits serialize their payload after the handler has released state_lock,
+    so sending the live dict could expose a concurrent handler's partial update.
+    """
+    with state_lock:
+        return copy.deepcopy(demo_state)
+
 def reset_demo():
     """
     Reset the demo state to initial values.
@@ -108,11 +180,35 @@ def reset_demo():
     Broadcasts the reset state to all connected clients via WebSocket.
     """
     logger.info("Demo state reset.")
-    demo_state['current_slide'] = 0
-    demo_state['status'] = 'idle'
-    demo_state['controller_input'] = {}
-    demo_state['current_demo'] = None
-    socketio.emit('state_update', demo_state, namespace='/')
+    with state_lock:
+        demo_state['current_slide'] = 0
+        demo_state['status'] = 'idle'
+        demo_state['controller_input'] = {}
+        demo_state['current_demo'] = None
+        snapshot = copy.deepcopy(demo_state)
+    socketio.emit('state_update', snapshot, namespace='/')
+
+
+def require_admin(view):
+    """
+    Decorator restricting a Flask route to requests carrying the admin token.
+
+    Clients must send 'Authorization: Bearer <ADMIN_TOKEN>'. If ADMIN_TOKEN is
+    not configured, admin routes are disabled and always return 403.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not Config.ADMIN_TOKEN:
+            return jsonify({'success': False, 'error': 'Admin endpoints are disabled'}), 403
+
+        auth_header = request.headers.get('Authorization', '')
+        token = auth_header[len('Bearer '):] if auth_header.startswith('Bearer ') else ''
+        if not hmac.compare_digest(token.encode(), Config.ADMIN_TOKEN.encode()):
+            logger.warning(f"Rejected admin request from {request.remote_addr}: {request.path}")
+            return jsonify({'success': False, 'error': 'Unauthorized'}), 401
+
+        return view(*args, **kwargs)
+    return wrapper
 
 
 # Error handlers (kept for completeness)
@@ -143,7 +239,8 @@ def handle_exception(e):
 # --- 1. Connection/Disconnection Logging ---
 
 @socketio.on('connect')
-def handle_connect():
+@profiler.profiled
+def handle_connect(auth=None):
     """
     Handle new WebSocket connections.
 
@@ -156,14 +253,21 @@ def handle_connect():
         2. Client sends 'identify' event with role information
         3. Server designates controller based on role, not connection order
         4. Log connection to database for analytics
+
+    Args:
+        auth (dict, optional): Authentication data sent by the client (unused).
+            Accepting it avoids Flask-SocketIO retrying the handler without
+            arguments, which would be counted twice while profiling.
     """
     logger.info(f"[LOG: CONNECTION] New connection established. SID: {request.sid}, IP: {request.remote_addr}")
     # Send welcome message and current state to newly connected client
     emit('server_message', {'data': f'Connected. Please identify your role.'})
-    emit('state_update', demo_state)
+    emit('state_update', snapshot_state())
 
 
 @socketio.on('identify')
+@rate_limiter.limit('identify', exempt_first=True)
+@profiler.profiled
 def handle_identify(data):
     """
     Handle client identification to determine role (controller vs. demo-site).
@@ -191,17 +295,33 @@ def handle_identify(data):
         if old_controller_sid and old_controller_sid != request.sid:
             logger.info(f"[LOG: CONTROLLER REPLACE] Replaced previous controller (SID: {old_controller_sid})")
 
-        # Log interaction to database for analytics
-        log_interaction('connect', f'Controller connected from {client_ip} (SID: {request.sid})')
+        # Queue interaction for analytics; the handler never waits on the database
+        queue_interaction(
+            'connect',
+            f'Controller connected from {client_ip} (SID: {request.sid})',
+            sid=request.sid,
+            client_ip=client_ip,
+            role='controller'
+        )
 
         # Send confirmation to the controller
         emit('server_message', {'data': f'Welcome, Controller {request.sid[:4]}...'})
-        emit('state_update', demo_state)
+        emit('state_update', snapshot_state())
 
     elif role == 'demo-site':
         logger.info(f"[LOG: DEMO-SITE CONNECT] Demo-site identified. SID: {request.sid}, IP: {client_ip}")
+
+        # Queue rather than write synchronously; demo-sites reconnect often
+        queue_interaction(
+            'connect',
+            f'Demo-site connected from {client_ip} (SID: {request.sid})',
+            sid=request.sid,
+            client_ip=client_ip,
+            role='demo-site'
+        )
+
         emit('server_message', {'data': 'Welcome, Demo-Site.'})
-        emit('state_update', demo_state)
+        emit('state_update', snapshot_state())
 
     else:
         logger.warning(f"[LOG: UNKNOWN ROLE] Unknown role '{role}' from SID: {request.sid}")
@@ -209,6 +329,7 @@ def handle_identify(data):
 
 
 @socketio.on('disconnect')
+@profiler.profiled
 def handle_disconnect():
     """
     Handle WebSocket disconnections.
@@ -226,11 +347,21 @@ def handle_disconnect():
     global active_controller_sid
 
     session_id = request.sid
+    rate_limiter.forget_sid(session_id)
 
     if session_id == active_controller_sid:
         logger.info(f"[LOG: CONTROLLER DISCONNECT] Primary controller disconnected. SID: {session_id}")
-        # Log disconnection to database for analytics
-        log_interaction('disconnect', f'Controller disconnected (SID: {session_id})')
+        # Queue disconnection for analytics, with the demo and slide it left
+        snapshot = snapshot_state()
+        queue_interaction(
+            'disconnect',
+            f'Controller disconnected (SID: {session_id})',
+            sid=session_id,
+            client_ip=request.remote_addr,
+            role='controller',
+            demo=snapshot['current_demo'],
+            slide=snapshot['current_slide']
+        )
 
         # Clear active controller tracking and reset the demo state
         active_controller_sid = None
@@ -242,7 +373,162 @@ def handle_disconnect():
 
 # --- 2. Controller Input Handler (Unified Event) ---
 
+# Demo identifiers accepted by the set_demo action
+KNOWN_DEMOS = ('logic-gates', 'searching-sorting')
+
+# Actions understood by apply_controller_action(). Inputs with anything else are
+# rejected, and batches are rejected up front so no partial state is ever applied.
+# 'play' and 'pause' are sent by the controller but do not change state yet.
+CONTROLLER_ACTIONS = (
+    'play',
+    'pause',
+    'navigate',
+    'reset_animation',
+    'start_sorting',
+    'set_demo',
+    'logic_gates_input',
+    'navigate_to_home',
+)
+
+
+def apply_controller_action(state, action, payload, timestamp=None):
+    """
+    Apply a single controller action to a demo state dictionary.
+
+    This is the pure state transition shared by the single-action and batched
+    controller_input handlers. It only mutates the given state; Socket.IO room
+    membership and broadcasting are left to the caller.
+
+    Args:
+        state (dict): The demo state to update (demo_state or a working copy)
+        action (str): The action to perform (see CONTROLLER_ACTIONS)
+        payload (dict): Action-specific data
+        timestamp (int, optional): Client timestamp for deduplication
+
+    Raises:
+        ValueError: If the action's payload is missing required fields or
+            names an unknown demo
+    """
+    # Navigation between slides with wraparound logic
+    if action == 'navigate':
+        direction = payload.get('direction')
+        # Update controller_input so the frontend can react to navigation
+        state['controller_input'] = {
+            'action': action,
+            'payload': payload,
+            'timestamp': timestamp
+        }
+
+        # Navigate through slides with wraparound at demo boundaries
+        match direction:
+            case 'next':
+                # Logic Gates demo has 8 slides (0-7)
+                if state['current_demo'] == 'logic-gates' and state['current_slide'] == 7:
+                    state['current_slide'] = 0  # Wrap to beginning
+                # Searching/Sorting demo has 33 slides (0-32)
+                elif state['current_demo'] == 'searching-sorting' and state['current_slide'] == 32:
+                    state['current_slide'] = 0  # Wrap to beginning
+                    state['status'] = 'playing' if state['status'] == 'sorting' else state['status']
+                else:
+                    state['current_slide'] += 1
+                    state['status'] = 'playing' if state['status'] == 'sorting' else state['status']
+                    state['status'] = 'idle' if state['status'] == 'home' else state['status']
+            case 'prev':
+                # Wrap backwards from first slide to last slide
+                if state['current_demo'] == 'logic-gates' and state['current_slide'] == 0:
+                    state['current_slide'] = 7  # Wrap to end
+                elif state['current_demo'] == 'searching-sorting' and state['current_slide'] == 0:
+                    state['current_slide'] = 32  # Wrap to end
+                    state['status'] = 'playing' if state['status'] == 'sorting' else state['status']
+                else:
+                    state['current_slide'] = max(0, state['current_slide'] - 1)
+                    state['status'] = 'playing' if state['status'] == 'sorting' else state['status']
+                    state['status'] = 'idle' if state['status'] == 'home' else state['status']
+
+    # Reset animation to initial state
+    elif action == 'reset_animation':
+        state['status'] = 'playing'
+
+    # Start the sorting visualization
+    elif action == 'start_sorting':
+        state['status'] = 'sorting'
+
+    # Switch to a different demo
+    elif action == 'set_demo':
+        new_demo = payload.get('demo')
+        # The home page controller sends route paths such as '/logic-gates'
+        if isinstance(new_demo, str):
+            new_demo = new_demo.lstrip('/')
+        if new_demo not in KNOWN_DEMOS:
+            raise ValueError(f"Unknown demo: {new_demo}")
+        state['current_demo'] = new_demo
+        state['current_slide'] = 0
+        state['status'] = 'playing'
+
+    # Update logic gate input values (A and B toggles)
+    elif action == 'logic_gates_input':
+        state['controller_input'] = payload
+
+    # Return to home screen
+    elif action == 'navigate_to_home':
+        state['current_demo'] = None
+        state['current_slide'] = 0
+        state['status'] = 'home'
+        state['controller_input'] = {}
+
+
+def record_controller_action(action, payload, demo, slide):
+    """
+    Queue a demo-level controller event for batched analytics logging.
+
+    Events go through database.queue_interaction(), so the input handlers never
+    wait on the database. Must be called from within a Socket.IO handler.
+
+    Args:
+        action (str): The applied controller action
+        payload (dict): Action-specific data, stored as JSONB metadata
+        demo (str | None): Active demo after the action
+        slide (int): Active slide after the action
+    """
+    queue_interaction(
+        action,
+        sid=request.sid,
+        client_ip=request.remote_addr,
+        role='controller',
+        demo=demo,
+        slide=slide,
+        metadata=payload or None
+    )
+
+
+def sync_controller_room(old_demo, new_demo):
+    """
+    Move the requesting controller between per-demo Socket.IO rooms.
+
+    Must be called from within a Socket.IO handler, since join_room() and
+    leave_room() act on the current request's SID.
+
+    Args:
+        old_demo (str | None): Demo the controller was in before the update
+        new_demo (str | None): Demo the controller is in after the update
+    """
+    if old_demo == new_demo:
+        return
+
+    # 1. Clean up from previous demo room if necessary
+    if old_demo:
+        leave_room(CONTROLLER_ROOM_PREFIX + old_demo)
+        logger.info(f"SID {request.sid} left room: {CONTROLLER_ROOM_PREFIX + old_demo}")
+
+    # 2. Join the new demo's Socket.IO room for targeted messaging
+    if new_demo:
+        join_room(CONTROLLER_ROOM_PREFIX + new_demo)
+        logger.info(f"SID {request.sid} joined room: {CONTROLLER_ROOM_PREFIX + new_demo}")
+
+
 @socketio.on('controller_input')
+@rate_limiter.limit('controller_input')
+@profiler.profiled
 def handle_controller_input(data):
     """
     Handle all controller input events from the demo-controller.
@@ -252,6 +538,7 @@ def handle_controller_input(data):
     connected clients (including the demo-site display).
 
     Supported actions:
+        - play, pause: Accepted and broadcast without changing state
         - navigate: Move between slides (next/prev)
         - set_demo: Switch to a different demo
         - reset_animation: Reset the current animation
@@ -267,10 +554,13 @@ def handle_controller_input(data):
 
     Security:
         Only the active controller (identified by session ID) can send inputs.
-        Unauthorized inputs are ignored and logged as warnings.
+        Unauthorized inputs are ignored and counted in the rate limiter stats;
+        a warning is logged once per SID.
     """
     if request.sid != active_controller_sid:
-        logger.warning(f"Ignoring input from unauthorized SID: {request.sid}")
+        # Cheap rejection: count every packet, log only the first per SID
+        if rate_limiter.reject_unauthorized('controller_input', request.sid):
+            logger.warning(f"Ignoring input from unauthorized SID: {request.sid}")
         return
 
     try:
@@ -279,93 +569,143 @@ def handle_controller_input(data):
 
         logger.info(f"[LOG: INPUT] Received input -> Action: {action}, Payload: {payload}")
 
-        # Update demo_state based on action
-        # Navigation between slides with wraparound logic
-        if action == 'navigate':
-            direction = payload.get('direction')
-            # Update controller_input so the frontend can react to navigation
-            demo_state['controller_input'] = {
-                'action': action,
-                'payload': payload,
-                'timestamp': data.get('timestamp')
-            }
-
-            # Navigate through slides with wraparound at demo boundaries
-            match direction:
-                case 'next':
-                    # Logic Gates demo has 8 slides (0-7)
-                    if demo_state['current_demo'] == 'logic-gates' and demo_state['current_slide'] == 7:
-                        demo_state['current_slide'] = 0  # Wrap to beginning
-                    # Searching/Sorting demo has 33 slides (0-32)
-                    elif demo_state['current_demo'] == 'searching-sorting' and demo_state['current_slide'] == 32:
-                        demo_state['current_slide'] = 0  # Wrap to beginning
-                        demo_state['status'] = 'playing' if demo_state['status'] == 'sorting' else demo_state['status']
-                    else:
-                        demo_state['current_slide'] += 1
-                        demo_state['status'] = 'playing' if demo_state['status'] == 'sorting' else demo_state['status']
-                        demo_state['status'] = 'idle' if demo_state['status'] == 'home' else demo_state['status']
-                case 'prev':
-                    # Wrap backwards from first slide to last slide
-                    if demo_state['current_demo'] == 'logic-gates' and demo_state['current_slide'] == 0:
-                        demo_state['current_slide'] = 7  # Wrap to end
-                    elif demo_state['current_demo'] == 'searching-sorting' and demo_state['current_slide'] == 0:
-                        demo_state['current_slide'] = 32  # Wrap to end
-                        demo_state['status'] = 'playing' if demo_state['status'] == 'sorting' else demo_state['status']
-                    else:
-                        demo_state['current_slide'] = max(0, demo_state['current_slide'] - 1)
-                        demo_state['status'] = 'playing' if demo_state['status'] == 'sorting' else demo_state['status']
-                        demo_state['status'] = 'idle' if demo_state['status'] == 'home' else demo_state['status']
-
-        # Reset animation to initial state
-        elif action == 'reset_animation':
-            demo_state['status'] = 'playing'
-
-        # Start the sorting visualization
-        elif action == 'start_sorting':
-            demo_state['status'] = 'sorting'
-
-        # Switch to a different demo
-        elif action == 'set_demo':
-            new_demo = payload.get('demo')
-            # 1. Clean up from previous demo room if necessary
-            if demo_state['current_demo']:
-                leave_room(CONTROLLER_ROOM_PREFIX + demo_state['current_demo'])
-                logger.info(f"SID {request.sid} left room: {CONTROLLER_ROOM_PREFIX + demo_state['current_demo']}")
-
-            # 2. Join the new demo's Socket.IO room for targeted messaging
-            join_room(CONTROLLER_ROOM_PREFIX + new_demo)
-            logger.info(f"SID {request.sid} joined room: {CONTROLLER_ROOM_PREFIX + new_demo}")
-
-            # 3. Update state to reflect the new demo
-            demo_state['current_demo'] = new_demo
-            demo_state['current_slide'] = 0
-            demo_state['status'] = 'playing'
-
-        # Update logic gate input values (A and B toggles)
-        elif action == 'logic_gates_input':
-            demo_state['controller_input'] = payload
-
-        # Return to home screen
-        elif action == 'navigate_to_home':
-            # Clean up from current demo room
-            if demo_state['current_demo']:
-                leave_room(CONTROLLER_ROOM_PREFIX + demo_state['current_demo'])
-                logger.info(f"SID {request.sid} left room: {CONTROLLER_ROOM_PREFIX + demo_state['current_demo']}")
-
-            # Reset to home state
-            demo_state['current_demo'] = None
-            demo_state['current_slide'] = 0
-            demo_state['status'] = 'home'
-            demo_state['controller_input'] = {}
+        if action not in CONTROLLER_ACTIONS:
+            raise ValueError(f'Unknown action: {action}')
+
+        with state_lock:
+            old_demo = demo_state['current_demo']
+            apply_controller_action(demo_state, action, payload, data.get('timestamp'))
+            sync_controller_room(old_demo, demo_state['current_demo'])
+            # Snapshot under the lock so a concurrent update cannot change what is recorded or sent
+            snapshot = copy.deepcopy(demo_state)
+
+        record_controller_action(action, payload, snapshot['current_demo'], snapshot['current_slide'])
 
         # Broadcast the updated state to all connected clients (controller and demo-site)
-        socketio.emit('state_update', demo_state, namespace='/')
+        socketio.emit('state_update', snapshot, namespace='/')
 
     except Exception as e:
         logger.error(f"Error processing controller input: {e}")
         # Send error message back to the client for debugging
         emit('server_message', {'data': f'Error processing input: {e}'})
 
+
+# Prebuilt acknowledgement for batches dropped by the rate limiter
+RATE_LIMITED_BATCH_ACK = {'success': False, 'error': 'Rate limited', 'results': []}
+
+
+@socketio.on('controller_input_batch')
+@rate_limiter.limit('controller_input_batch', rejected=RATE_LIMITED_BATCH_ACK)
+@profiler.profiled
+def handle_controller_input_batch(data):
+    """
+    Handle an ordered batch of controller actions as a single atomic update.
+
+    Composite gestures (e.g., switching demo and jumping to a slide, or setting
+    several logic gate inputs) are sent as one event instead of one round trip
+    per action. The whole batch is validated once and applied to a working copy
+    of demo_state; the copy only replaces demo_state if every action succeeds,
+    so the demo-site never sees intermediate states. Exactly one state_update is
+    broadcast per successful batch.
+
+    Args:
+        data (dict): Batch data containing:
+            - actions (list): Ordered list of {action, payload, timestamp} dicts
+            - timestamp (int, optional): Client timestamp used for actions
+              that do not carry their own
+
+    Returns:
+        dict: Acknowledgement sent back to the client's emit callback:
+            - success (bool): Whether the batch was applied
+            - results (list): One entry per action with index, action, ok,
+              and error (None on success). When success is False no action
+              was applied, so every entry has ok set to False
+
+    Security:
+        Only the active controller (identified by session ID) can send inputs.
+        Unauthorized batches are ignored and counted in the rate limiter stats;
+        a warning is logged once per SID.
+    """
+    if request.sid != active_controller_sid:
+        # Cheap rejection: count every packet, log only the first per SID
+        if rate_limiter.reject_unauthorized('controller_input_batch', request.sid):
+            logger.warning(f"Ignoring input batch from unauthorized SID: {request.sid}")
+        return {'success': False, 'error': 'Unauthorized', 'results': []}
+
+    actions = data.get('actions') if isinstance(data, dict) else None
+    if not isinstance(actions, list) or not actions:
+        return {'success': False, 'error': "Batch requires a non-empty 'actions' list", 'results': []}
+    if len(actions) > Config.MAX_BATCH_ACTIONS:
+        return {
+            'success': False,
+            'error': f'Batch exceeds {Config.MAX_BATCH_ACTIONS} actions',
+            'results': []
+        }
+
+    # Validate the whole batch before touching any state
+    results = []
+    for index, item in enumerate(actions):
+        action = item.get('action') if isinstance(item, dict) else None
+        payload = item.get('payload', {}) if isinstance(item, dict) else None
+        error = None
+        if action not in CONTROLLER_ACTIONS:
+            error = f'Unknown action: {action}'
+        elif not isinstance(payload, dict):
+            error = 'Payload must be an object'
+        results.append({'index': index, 'action': action, 'ok': error is None, 'error': error})
+
+    if not all(result['ok'] for result in results):
+        # Nothing is applied, so valid actions are reported as not applied too
+        for result in results:
+            if result['ok']:
+                result['ok'] = False
+                result['error'] = 'Not applied: batch rejected'
+        return {'success': False, 'results': results}
+
+    logger.info(f"[LOG: INPUT BATCH] Received {len(actions)} actions -> "
+                f"{[item['action'] for item in actions]}")
+
+    with state_lock:
+        # Apply to a working copy so a failing action leaves demo_state untouched
+        working_state = copy.deepcopy(demo_state)
+        applied = []
+        for index, item in enumerate(actions):
+            try:
+                apply_controller_action(
+                    working_state,
+                    item['action'],
+                    item.get('payload', {}),
+                    item.get('timestamp', data.get('timestamp'))
+                )
+                applied.append((item['action'], item.get('payload', {}),
+                                working_state['current_demo'], working_state['current_slide']))
+            except Exception as e:
+                logger.error(f"Error processing batched input #{index}: {e}")
+                results[index]['ok'] = False
+                results[index]['error'] = str(e)
+                # Earlier actions were discarded with the working copy
+                for discarded in results[:index]:
+                    discarded['ok'] = False
+                    discarded['error'] = 'Not applied: batch rejected'
+                # Later actions were never applied
+                for skipped in results[index + 1:]:
+                    skipped['ok'] = False
+                    skipped['error'] = 'Skipped: earlier action failed'
+                return {'success': False, 'results': results}
+
+        old_demo = demo_state['current_demo']
+        demo_state.update(working_state)
+        sync_controller_room(old_demo, demo_state['current_demo'])
+        snapshot = copy.deepcopy(demo_state)
+
+    # Broadcast the final state once for the whole batch
+    socketio.emit('state_update', snapshot, namespace='/')
+
+    # Record each applied action with the demo and slide it produced
+    for action, payload, demo, slide in applied:
+        record_controller_action(action, payload, demo, slide)
+    return {'success': True, 'results': results}
+
 # ----------------------------------------------------------------------
 # TRADITIONAL FLASK ROUTES (for Health Checks, Logs, etc.)
 # ----------------------------------------------------------------------
@@ -392,7 +732,7 @@ def get_status():
             "controller_input": {"inputA": true, "inputB": false}
         }
     """
-    return jsonify(demo_state)
+    return jsonify(snapshot_state())
 
 @app.route('/api/reset', methods=['POST'])
 def reset_demo_route():
@@ -406,9 +746,11 @@ def reset_demo_route():
         JSON object with success status and updated state.
     """
     reset_demo()
-    return jsonify({'success': True, 'state': demo_state})
+    return jsonify({'success': True, 'state': snapshot_state()})
 
 @socketio.on('request_state')
+@rate_limiter.limit('request_state', exempt_first=True)
+@profiler.profiled
 def handle_state_request():
     """
     Handle state request from demo-site.
@@ -417,7 +759,7 @@ def handle_state_request():
     to resynchronize. This sends the current demo_state to the requesting client.
     """
     try:
-        emit('state_update', demo_state)
+        emit('state_update', snapshot_state())
     except Exception as e:
         logger.error(f'Error handling state request: {e}')
 
@@ -431,6 +773,120 @@ def health_check():
     """
     return jsonify({'status': 'healthy'})
 
+@app.route('/api/rate-limit/stats', methods=['GET'])
+def get_rate_limit_stats():
+    """
+    Get aggregated counters of Socket.IO events dropped by the rate limiter.
+
+    Rejected events are not logged individually, so this endpoint is the
+    place to check whether clients are being throttled. Controller input
+    from non-controller sockets is counted under the 'unauthorized' scope.
+
+    Returns:
+        JSON object containing:
+            - success (bool): Always True
+            - stats (dict): enabled flag, per-event rejection counts by scope
+              ('sid', 'ip', or 'unauthorized'), total_rejected, and active_buckets
+
+    Example:
+        GET /api/rate-limit/stats
+    """
+    return jsonify({'success': True, 'stats': rate_limiter.stats()})
+
+@app.route('/api/admin/profile/start', methods=['POST'])
+@require_admin
+def start_profiling():
+    """
+    Start profiling Socket.IO handlers and database calls for a bounded window.
+
+    Query parameters:
+        mode (str): 'deterministic' (cProfile, exact call counts) or
+            'sampling' (periodic stack samples) (default: deterministic)
+        duration (float): Window length in seconds (default: 30,
+            capped at PROFILE_MAX_DURATION)
+        interval (float): Seconds between samples in sampling mode (default: 0.005,
+            minimum: 0.001)
+
+    Returns:
+        JSON object with success status and the new session's status.
+
+    Example:
+        POST /api/admin/profile/start?mode=sampling&duration=60
+    """
+    mode = request.args.get('mode', 'deterministic')
+    duration = min(request.args.get('duration', 30, type=float), Config.PROFILE_MAX_DURATION)
+    interval = request.args.get('interval', 0.005, type=float)
+
+    if mode not in PROFILE_MODES:
+        return jsonify({
+            'success': False,
+            'error': f"Unknown mode '{mode}'. Use one of: {', '.join(PROFILE_MODES)}"
+        }), 400
+
+    try:
+        status = profiler.start(mode=mode, duration=duration, interval=interval)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+    logger.info(f"[LOG: PROFILE] Started {mode} profiling for {duration}s from {request.remote_addr}")
+    return jsonify({'success': True, 'profile': status})
+
+@app.route('/api/admin/profile/stop', methods=['POST'])
+@require_admin
+def stop_profiling():
+    """
+    Stop the active profiling session before its window elapses.
+
+    Returns:
+        JSON object with success status and the stopped session's status.
+    """
+    status = profiler.stop()
+    logger.info("[LOG: PROFILE] Profiling stopped")
+    return jsonify({'success': True, 'profile': status})
+
+@app.route('/api/admin/profile', methods=['GET'])
+@require_admin
+def get_profile():
+    """
+    Retrieve aggregated results of the active or most recent profiling session.
+
+    Query parameters:
+        format (str): 'json' (default) or 'collapsed' for a flamegraph-compatible
+            collapsed-stack text file (sampling mode only)
+        limit (int): Maximum number of top functions to return (default: 30)
+        sort (str): 'cumulative' or 'tottime' in deterministic mode,
+            'total' or 'self' in sampling mode (default: cumulative / total)
+
+    Returns:
+        JSON object containing:
+            - success (bool): Whether results are available
+            - profile (dict): Session status, per-handler calls and time,
+              and top_functions with call counts and timings
+
+    Example:
+        GET /api/admin/profile?limit=20
+        GET /api/admin/profile?format=collapsed > handlers.folded
+    """
+    if request.args.get('format') == 'collapsed':
+        collapsed = profiler.collapsed()
+        if collapsed is None:
+            return jsonify({
+                'success': False,
+                'error': 'Collapsed stacks are only available for sampling mode sessions'
+            }), 400
+        return collapsed, 200, {
+            'Content-Type': 'text/plain; charset=utf-8',
+            'Content-Disposition': 'attachment; filename=profile.folded'
+        }
+
+    limit = max(1, request.args.get('limit', 30, type=int))
+    sort = request.args.get('sort', 'cumulative')
+    results = profiler.results(limit=limit, sort=sort)
+    if not results:
+        return jsonify({'success': False, 'error': 'No profiling session has been run'}), 404
+
+    return jsonify({'success': True, 'profile': results})
+
 @app.route('/api/interaction-log', methods=['GET'])
 def get_interaction_log():
     """
@@ -438,19 +894,31 @@ def get_interaction_log():
 
     Query parameters:
         limit (int): Maximum number of logs to retrieve (default: 100)
+        event_type (str, optional): Only return events of this type
+        sid (str, optional): Only return events from this Socket.IO session
+        client_ip (str, optional): Only return events from this address
+        demo (str, optional): Only return events recorded in this demo
 
     Returns:
         JSON object containing:
             - success (bool): Whether the request succeeded
-            - log (list): List of log entries with id, event_type, timestamp, and details
+            - log (list): List of log entries with id, event_type, timestamp, details,
+              and the structured sid, client_ip, role, demo, slide, and metadata fields
             - count (int): Number of log entries returned
 
     Example:
         GET /api/interaction-log?limit=50
+        GET /api/interaction-log?demo=logic-gates&event_type=navigate
     """
     try:
         limit = request.args.get('limit', 100, type=int)
-        logs = get_interaction_logs(limit=limit)
+        logs = get_interaction_logs(
+            limit=limit,
+            event_type=request.args.get('event_type'),
+            sid=request.args.get('sid'),
+            client_ip=request.args.get('client_ip'),
+            demo=request.args.get('demo')
+        )
 
         return jsonify({
             'success': True,